@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 class DocumentToPdfConverter:
     """Convert Office documents to PDF using LibreOffice."""
 
-    SUPPORTED_FORMATS = {'.docx', '.pptx', '.xlsx'}
+    SUPPORTED_FORMATS = frozenset({'.docx', '.pptx', '.xlsx'})
 
     def __init__(self) -> None:
         self.supported_formats = self.SUPPORTED_FORMATS
@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 class HtmlToPdfConverter:
     """Convert HTML files or URLs to PDF using wkhtmltopdf."""
 
-    SUPPORTED_FORMATS = {'.html', '.htm'}
+    SUPPORTED_FORMATS = frozenset({'.html', '.htm'})
 
     def __init__(self) -> None:
         self.supported_formats = self.SUPPORTED_FORMATS
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 class ImageToPdfConverter:
     """Convert images to PDF format"""
     
-    SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif', '.webp'}
+    SUPPORTED_FORMATS = frozenset({'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif', '.webp'})
     COMPRESSION_QUALITY = {
         'high': 95,    # Best quality, larger file
         'medium': 85,  # Good balance
@@ -87,6 +87,37 @@ class ImageToPdfConverter:
             logger.error(f"Error compressing image {image_path}: {e}")
             return image_path  # Return original if compression fails
     
+    def downscale_image(self, image_path: str, max_side: int, quality: int = 90,
+                        output_path: Optional[str] = None) -> bool:
+        """
+        Shrink an image so its longest side is at most max_side
+        
+        Args:
+            image_path: Path to the image file
+            max_side: Longest allowed side in pixels
+            quality: JPEG quality of the shrunk image
+            output_path: Where to write the shrunk JPEG; defaults to overwriting image_path
+        
+        Returns:
+            True if a resized image was written, False if it was already small enough
+        """
+        with Image.open(image_path) as img:
+            if max(img.size) <= max_side or getattr(img, 'is_animated', False):
+                return False
+            original_size = img.size
+            # Let the JPEG decoder skip straight to a reduced scale
+            img.draft('RGB', (max_side, max_side))
+            if img.mode not in ('RGB', 'L'):
+                img = img.convert('RGB')
+            img.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=quality, optimize=True)
+        
+        with open(output_path or image_path, 'wb') as f:
+            f.write(buffer.getvalue())
+        logger.info(f"Image downscaled: {original_size[0]}x{original_size[1]} -> {img.size[0]}x{img.size[1]}")
+        return True
+    
     def is_supported_format(self, file_path: str) -> bool:
         """Check if file format is supported"""
         _, ext = os.path.splitext(file_path.lower())
@@ -106,7 +137,24 @@ class ImageToPdfConverter:
             logger.error(f"Error getting image info for {image_path}: {e}")
             return {}
     
-    def convert_single_image(self, image_path: str, output_path: str = None, compress: str = None) -> dict:
+    def get_image_info_from_bytes(self, data: bytes, partial: bool = False) -> dict:
+        """Get image information from an in-memory image; partial means data is only the file's head"""
+        try:
+            with Image.open(io.BytesIO(data)) as img:
+                return {
+                    'format': img.format,
+                    'size': img.size,
+                    'mode': img.mode,
+                    'file_size': len(data)
+                }
+        except Exception as e:
+            # Some formats keep their metadata past the head, so a partial miss is expected
+            log = logger.debug if partial else logger.error
+            log(f"Error getting image info from buffer: {e}")
+            return {}
+    
+    def convert_single_image(self, image_path: str, output_path: str = None, compress: str = None,
+                             return_bytes: bool = False, image_info: Optional[dict] = None) -> dict:
         """
         Convert a single image to PDF
         
@@ -114,6 +162,8 @@ class ImageToPdfConverter:
             image_path: Path to the image file
             output_path: Path for the output PDF file (optional)
             compress: Compression quality ('high', 'medium', 'low') (optional)
+            return_bytes: Include the generated PDF bytes as 'pdf_bytes' (optional)
+            image_info: Already-known 'format' and 'size', skipping a re-probe (optional)
             
         Returns:
             Dictionary with conversion results including file sizes
@@ -129,7 +179,7 @@ class ImageToPdfConverter:
             output_path = f"{base_name}.pdf"
         
         # Get original image info
-        original_info = self.get_image_info(image_path)
+        original_info = image_info or self.get_image_info(image_path)
         original_file_info = self.get_file_info(image_path)
         
         # Compress image if requested
@@ -141,11 +191,9 @@ class ImageToPdfConverter:
             logger.info(f"Converting {image_path} ({original_info.get('format', 'unknown')}) to PDF")
             
             # Convert image to PDF
+            pdf_data = img2pdf.convert(working_image_path, rotation=img2pdf.Rotation.ifvalid)
             with open(output_path, "wb") as f:
-                f.write(img2pdf.convert(working_image_path, rotation=img2pdf.Rotation.ifvalid))
-            
-            # Get PDF file info
-            pdf_info = self.get_file_info(output_path)
+                f.write(pdf_data)
             
             # Clean up compressed image if created
             if compress and working_image_path != image_path:
@@ -155,11 +203,13 @@ class ImageToPdfConverter:
                 'success': True,
                 'pdf_path': output_path,
                 'original_size': original_file_info.get('file_size_formatted', 'Unknown'),
-                'pdf_size': pdf_info.get('file_size_formatted', 'Unknown'),
+                'pdf_size': self.format_file_size(len(pdf_data)),
                 'original_format': original_info.get('format', 'Unknown'),
                 'image_dimensions': original_info.get('size', 'Unknown'),
                 'compression_used': compress or 'none'
             }
+            if return_bytes:
+                result['pdf_bytes'] = pdf_data
             
             logger.info(f"Successfully converted to {output_path} ({result['pdf_size']})")
             return result
@@ -220,11 +270,9 @@ class ImageToPdfConverter:
                     working_image_paths.append(img_path)
             
             # Convert multiple images to PDF
+            pdf_data = img2pdf.convert(working_image_paths, rotation=img2pdf.Rotation.ifvalid)
             with open(output_path, "wb") as f:
-                f.write(img2pdf.convert(working_image_paths, rotation=img2pdf.Rotation.ifvalid))
-            
-            # Get PDF file info
-            pdf_info = self.get_file_info(output_path)
+                f.write(pdf_data)
             
             # Clean up compressed images
             if compress:
@@ -236,7 +284,7 @@ class ImageToPdfConverter:
                 'success': True,
                 'pdf_path': output_path,
                 'total_original_size': self.format_file_size(total_original_size),
-                'pdf_size': pdf_info.get('file_size_formatted', 'Unknown'),
+                'pdf_size': self.format_file_size(len(pdf_data)),
                 'image_count': len(image_paths),
                 'compression_used': compress or 'none'
             }
@@ -82,6 +82,26 @@ class PdfTools:
             base = os.path.splitext(os.path.basename(pdf_path))[0]
             output_path = f"{base}_ocr.pdf"
 
+        try:
+            import ocrmypdf
+        except ImportError:
+            ocrmypdf = None
+        if ocrmypdf is not None:
+            # In-process API: the bot's pool workers import ocrmypdf once and
+            # reuse it, instead of starting a fresh interpreter per request
+            try:
+                ocrmypdf.ocr(
+                    pdf_path,
+                    output_path,
+                    language=language.split("+"),
+                    force_ocr=True,
+                    use_threads=True,
+                    progress_bar=False,
+                )
+            except ocrmypdf.exceptions.ExitCodeException as e:
+                raise RuntimeError(str(e) or "OCR failed") from e
+            return output_path
+
         ocrmypdf_path = shutil.which("ocrmypdf")
         if not ocrmypdf_path:
             raise RuntimeError("ocrmypdf not found. Install it to enable OCR.")
@@ -6,19 +6,41 @@ Clean, modular, and maintainable codebase
 
 import os
 import asyncio
+import atexit
+import functools
+import multiprocessing
+import itertools
+import queue
+import shutil
 import logging
 import tempfile
-from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Awaitable, Callable, Dict, Final, Iterable, Optional, List, Tuple
 from enum import Enum
 from dataclasses import dataclass
 
-from telegram import Update, BotCommand
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+import aiofiles
+import httpx
+import PIL
+from PIL import features as pil_features
+
+from telegram import Update, BotCommand, InputFile, InputMediaDocument
+from telegram.ext import AIORateLimiter, Application, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.constants import ParseMode as ParseMode
+from telegram.request import HTTPXRequest
+
+try:
+    import orjson
+except ImportError:  # optional: faster parsing of Bot API responses
+    orjson = None
 
 from image_converter import ImageToPdfConverter
+from document_converter import DocumentToPdfConverter
+from text_converter import TextToPdfConverter
+from html_converter import HtmlToPdfConverter
 from pdf_tools import PdfTools
 from message_templates import MessageTemplates
 
@@ -35,29 +57,121 @@ def mask_token(token: str) -> str:
         return token
     return f"{token[:6]}...{token[-4:]}"
 
+def extension_filter(formats) -> filters.BaseFilter:
+    """Build a document filter matching any of the given '.ext' formats"""
+    combined = None
+    for ext in sorted(formats):
+        ext_filter = filters.Document.FileExtension(ext.lstrip('.'))
+        combined = ext_filter if combined is None else combined | ext_filter
+    return combined
+
+class OrjsonRequest(HTTPXRequest):
+    """HTTPXRequest that decodes Bot API responses with orjson"""
+    
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> dict:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Invalid UTF-8 or JSON: let the stock parser replace, log and raise TelegramError
+            return HTTPXRequest.parse_json_payload(payload)
+
+# Command handlers: (command name and aliases, ImageToPdfBot method)
+COMMAND_SPEC: Final = (
+    (("start",), "start"),
+    (("help",), "help_command"),
+    (("clear",), "clear_command"),
+    (("convert",), "convert_command"),
+    (("convert_now", "convertnow"), "convert_now_command"),
+    (("compress_high", "compresshigh"), "set_compression_high"),
+    (("compress_medium", "compressmedium"), "set_compression_medium"),
+    (("compress_low", "compresslow"), "set_compression_low"),
+    (("merge",), "merge_pdfs_command"),
+    (("split",), "split_pdf_command"),
+    (("compress_pdf",), "compress_pdf_command"),
+    (("url2pdf",), "url_to_pdf_command"),
+    (("ocr",), "ocr_pdf_command"),
+    (("ocr_image",), "ocr_image_command"),
+)
+
+# Message handlers, in priority order; non-image documents are routed by
+# extension so each handler only sees its own formats
+MESSAGE_SPEC: Final = (
+    (filters.PHOTO, "handle_image"),
+    (filters.Document.IMAGE, "handle_document"),
+    (filters.Document.PDF | filters.Document.FileExtension("pdf"), "handle_pdf_document"),
+    (extension_filter(DocumentToPdfConverter.SUPPORTED_FORMATS), "handle_office_document"),
+    (extension_filter(TextToPdfConverter.SUPPORTED_FORMATS), "handle_text_document"),
+    (extension_filter(HtmlToPdfConverter.SUPPORTED_FORMATS), "handle_html_document"),
+    (filters.Document.ALL, "handle_unsupported_document"),
+)
+
+# Telegram accepts 2-10 items per sendMediaGroup call
+MEDIA_GROUP_LIMIT = 10
+
+# Telegram caps messages at 4096 chars; leave headroom for the part header
+MESSAGE_CHUNK_SIZE = 4000
+
+# Telegram flood limits: ~30 messages/s overall, 20 messages/min per group
+GLOBAL_SEND_RATE = (30, 1)
+GROUP_SEND_RATE = (20, 60)
+# Concurrent Bot API connections for regular (non-getUpdates) requests
+BOT_API_POOL_SIZE = 256
+# Retries on 429 Flood Wait before an outbound request gives up
+SEND_MAX_RETRIES = 3
+
+# PDFs up to this size are kept in memory after conversion and uploaded
+# straight from the buffer; larger ones are read back from disk at upload
+# time (off the event loop, but still whole, as PTB builds the body in memory)
+PDF_MEMORY_LIMIT = 20 * 1024 * 1024
+
+# Files at least this large are fetched as concurrent byte ranges
+PARALLEL_DOWNLOAD_THRESHOLD = 4 * 1024 * 1024
+PARALLEL_DOWNLOAD_CHUNK = 1024 * 1024
+PARALLEL_DOWNLOAD_WORKERS = 4
+
+# Leading bytes fetched to read image metadata while the full download runs
+IMAGE_HEAD_PROBE_SIZE = 64 * 1024
+
+# Reusable buffers that coalesce streamed network chunks into larger writes
+DOWNLOAD_BUFFER_SIZE = 64 * 1024
+DOWNLOAD_BUFFER_COUNT = 32
+
+# Longest side images are shrunk to when converting at medium/low compression
+CONVERSION_MAX_SIDE = 2000
+
+# Maximum number of queued file deletions handled per worker-thread hop
+CLEANUP_BATCH_SIZE = 32
+
+# Scratch directories are named <prefix><pid>_<random> so leftovers from a
+# crashed run can be recognised and removed on the next start
+SCRATCH_PREFIX = 'doc2pdf_'
+
+# The Bot API refuses getFile for anything larger than this
+MAX_DOWNLOAD_SIZE = 20 * 1024 * 1024
+
+# Album photos arriving within this many seconds of each other share one reply
+MEDIA_GROUP_DEBOUNCE = 0.5
+
+# Session store defaults: most sessions kept, idle lifetime and sweep period (seconds)
+MAX_SESSIONS = 5000
+SESSION_TTL = 24 * 60 * 60
+SESSION_SWEEP_INTERVAL = 10 * 60
+
+
 class CompressionLevel(Enum):
     """Compression quality levels"""
-    HIGH = "high"
-    MEDIUM = "medium"
-    LOW = "low"
-    
-    @property
-    def quality(self) -> int:
-        """Get compression quality percentage"""
-        return {
-            CompressionLevel.HIGH: 95,
-            CompressionLevel.MEDIUM: 85,
-            CompressionLevel.LOW: 70
-        }[self]
-    
-    @property
-    def title(self) -> str:
-        """Get human-readable title"""
-        return {
-            CompressionLevel.HIGH: "High Quality (95%)",
-            CompressionLevel.MEDIUM: "Medium Quality (85%)",
-            CompressionLevel.LOW: "Low Quality (70%)"
-        }[self]
+    HIGH = ("high", 95, "High Quality (95%)")
+    MEDIUM = ("medium", 85, "Medium Quality (85%)")
+    LOW = ("low", 70, "Low Quality (70%)")
+    
+    def __new__(cls, value: str, quality: int, title: str):
+        member = object.__new__(cls)
+        member._value_ = value
+        # Plain attributes: compression percentage and human-readable title
+        member.quality = quality
+        member.title = title
+        return member
 
 
 @dataclass
@@ -73,6 +187,15 @@ class ConversionResult:
     image_count: Optional[int] = None
     total_original_size: Optional[str] = None
     error_message: Optional[str] = None
+    pdf_bytes: Optional[bytes] = None
+
+
+@dataclass
+class ConversionJob:
+    """Blocking conversion queued for the worker pool"""
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    future: asyncio.Future
 
 
 @dataclass
@@ -82,6 +205,8 @@ class ImageInfo:
     size: str
     format: str
     dimensions: Optional[str] = None
+    # (width, height) in pixels, handed to the converter so it needn't reopen the file
+    pixel_size: Optional[Tuple[int, int]] = None
 
 
 class UserSession:
@@ -89,27 +214,55 @@ class UserSession:
     def __init__(self, user_id: int):
         self.user_id = user_id
         self.temp_files: List[str] = []
+        # Probed metadata for pending images, keyed by temp file path
+        self.image_info: Dict[str, ImageInfo] = {}
         self.compression_setting: CompressionLevel = CompressionLevel.MEDIUM
         self.pdf_files: List[str] = []
+        self.last_active = time.monotonic()
+        # Serializes this user's updates; dropped together with the session
+        self.lock = asyncio.Lock()
+    
+    def touch(self):
+        """Mark the session as used now"""
+        self.last_active = time.monotonic()
+    
+    def clear_all_files(self):
+        """Clean up pending images and PDFs"""
+        self.clear_temp_files()
+        self.clear_pdf_files()
         
-    def add_temp_file(self, file_path: str):
-        """Add temporary file to session"""
+    def add_temp_file(self, file_path: str, info: Optional[ImageInfo] = None):
+        """Add temporary file to session, with its image metadata if already known"""
         self.temp_files.append(file_path)
+        if info is not None:
+            self.image_info[file_path] = info
     
     def clear_temp_files(self):
         """Clean up all temporary files"""
         for file_path in self.temp_files:
             try:
                 os.unlink(file_path)
-                logger.debug(f"Cleaned up temporary file: {file_path}")
+                logger.debug("Cleaned up temporary file: %s", file_path)
             except Exception as e:
-                logger.error(f"Error cleaning up file {file_path}: {e}")
+                logger.error("Error cleaning up file %s: %s", file_path, e)
         self.temp_files.clear()
+        self.image_info.clear()
+    
+    def take_temp_files(self) -> List[str]:
+        """Forget pending images and return their paths for deletion elsewhere"""
+        files, self.temp_files = self.temp_files, []
+        self.image_info.clear()
+        return files
 
     def add_pdf_file(self, file_path: str):
         """Add PDF file to session"""
         self.pdf_files.append(file_path)
 
+    def take_pdf_files(self) -> List[str]:
+        """Forget pending PDFs and return their paths for deletion elsewhere"""
+        files, self.pdf_files = self.pdf_files, []
+        return files
+
     def clear_pdf_files(self):
         """Clean up all pending PDF files"""
         for file_path in self.pdf_files:
@@ -128,13 +281,86 @@ class UserSession:
         return len(self.temp_files)
 
 
-class MessageTemplates:
-    """Centralized message templates"""
+class SessionStore:
+    """User sessions bounded by count (LRU) and idle time (TTL)"""
+    def __init__(self, max_sessions: int = MAX_SESSIONS, ttl: float = SESSION_TTL):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[int, UserSession]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._sessions)
+    
+    def get(self, user_id: int) -> UserSession:
+        """Get or create a session, evicting the least recently used idle one when full"""
+        session = self._sessions.get(user_id)
+        if session is None:
+            session = self._sessions[user_id] = UserSession(user_id)
+            while len(self._sessions) > self.max_sessions:
+                # A session whose lock is held is mid-update: its files are in use
+                # and its lock must survive, so let the store overflow instead
+                victim = next(
+                    (uid for uid, other in self._sessions.items()
+                     if uid != user_id and not other.lock.locked()),
+                    None
+                )
+                if victim is None:
+                    break
+                self._discard(self._sessions.pop(victim))
+        else:
+            self._sessions.move_to_end(user_id)
+            session.touch()
+        return session
+    
+    def expire_idle(self) -> int:
+        """Drop sessions idle longer than the TTL; returns how many were dropped"""
+        cutoff = time.monotonic() - self.ttl
+        stale = []
+        # Sessions are kept in recency order, so stop at the first fresh one
+        for user_id, session in self._sessions.items():
+            if session.last_active >= cutoff:
+                break
+            # Busy sessions are left for a later sweep
+            if not session.lock.locked():
+                stale.append(user_id)
+        for user_id in stale:
+            self._discard(self._sessions.pop(user_id))
+        return len(stale)
     
     @staticmethod
-    def welcome() -> str:
-        """Welcome message"""
-        return """
+    def _discard(session: UserSession) -> None:
+        """Delete an evicted session's files without blocking the event loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            session.clear_all_files()
+            return
+        loop.run_in_executor(None, session.clear_all_files)
+
+
+# Bot menu commands: the single source for set_my_commands and the command
+# lists in the welcome and help texts
+COMMAND_DESCRIPTIONS: Final[Tuple[Tuple[str, str], ...]] = (
+    ("start", "Start bot and see welcome message"),
+    ("help", "Show help message"),
+    ("convert", "Choose compression options"),
+    ("convert_now", "Convert with current settings"),
+    ("compress_high", "Set high quality compression (95%)"),
+    ("compress_medium", "Set medium quality compression (85%)"),
+    ("compress_low", "Set low quality compression (70%)"),
+    ("merge", "Merge pending PDFs"),
+    ("split", "Split last PDF into pages"),
+    ("compress_pdf", "Compress last PDF"),
+    ("url2pdf", "Convert URL to PDF"),
+    ("ocr", "OCR last PDF"),
+    ("ocr_image", "Extract text from last image (optional language)"),
+    ("clear", "Clear all pending images"),
+)
+
+COMMAND_LIST = "\n".join(f"/{name} - {description}" for name, description in COMMAND_DESCRIPTIONS)
+
+# Static replies, built once at import rather than on every /start or /help
+WELCOME_MESSAGE = f"""
 🖼️ **Image to PDF Converter Bot**
 
 Welcome! I can convert your images to PDF format.
@@ -159,27 +385,12 @@ Welcome! I can convert your images to PDF format.
 4. Download the PDF file with detailed size info
 
 **Commands:**
-/start - Show this help message
-/help - Show help message
-/convert - Choose compression options
-/convert_now - Convert with current settings
-/compress_high - Set high quality compression (95%)
-/compress_medium - Set medium quality compression (85%) - Default
-/compress_low - Set low quality compression (70%) - Smallest file
-/merge - Merge pending PDFs
-/split - Split the last PDF (one per page)
-/compress_pdf - Compress the last PDF
-/url2pdf - Convert a URL to PDF
-/ocr - Make the last PDF searchable
-/clear - Clear pending images
+{COMMAND_LIST}
 
 Send me some images to get started! 📸
         """
-    
-    @staticmethod
-    def help() -> str:
-        """Help message"""
-        return """
+
+HELP_MESSAGE = f"""
 📖 **Help - Image to PDF Converter**
 
 **Supported Formats:**
@@ -210,20 +421,7 @@ Send me some images to get started! 📸
 • Shows compression ratio when applicable
 
 **Commands:**
-/start - Start bot and see welcome message
-/convert - Choose compression options
-/convert_now - Convert with current settings
-/compress_high - Set high quality compression
-/compress_medium - Set medium quality compression
-/compress_low - Set low quality compression
-/merge - Merge pending PDFs
-/split - Split the last PDF (one per page)
-/compress_pdf - Compress the last PDF
-/url2pdf - Convert a URL to PDF
-/ocr - Make the last PDF searchable
-/ocr_image - Extract text from the last image (optional: specify language)
-/clear - Clear all pending images
-/help - Show this help message
+{COMMAND_LIST}
 
 **Tips:**
 • Send multiple images to combine them into one PDF
@@ -231,18 +429,37 @@ Send me some images to get started! 📸
 • Use compression for smaller file sizes
 • Temporary files are automatically cleaned up
         """
+
+COMPRESSION_MENU = (
+    "🔧 **Choose compression level:**\n\n"
+    "1️⃣ /compress_high - High Quality (95%)\n"
+    "2️⃣ /compress_medium - Medium Quality (85%) - Default\n"
+    "3️⃣ /compress_low - Low Quality (70%) - Smallest file\n"
+    "4️⃣ /convert_now - Use current setting\n"
+)
+
+
+class MessageTemplates:
+    """Centralized message templates"""
+    
+    @staticmethod
+    def welcome() -> str:
+        """Welcome message"""
+        return WELCOME_MESSAGE
+    
+    @staticmethod
+    def help() -> str:
+        """Help message"""
+        return HELP_MESSAGE
     
     @staticmethod
     def compression_options(image_count: int, current_setting: CompressionLevel) -> str:
         """Compression options message"""
-        message = f"🖼️ Found {image_count} image(s) to convert\n\n"
-        message += "🔧 **Choose compression level:**\n\n"
-        message += "1️⃣ /compress_high - High Quality (95%)\n"
-        message += "2️⃣ /compress_medium - Medium Quality (85%) - Default\n"
-        message += "3️⃣ /compress_low - Low Quality (70%) - Smallest file\n"
-        message += "4️⃣ /convert_now - Use current setting\n"
-        message += f"Current setting: {current_setting.title}"
-        return message
+        return (
+            f"🖼️ Found {image_count} image(s) to convert\n\n"
+            f"{COMPRESSION_MENU}"
+            f"Current setting: {current_setting.title}"
+        )
     
     @staticmethod
     def image_received(file_info: ImageInfo, pending_count: int) -> str:
@@ -255,6 +472,15 @@ Send me some images to get started! 📸
             f"Send more images or use /convert when ready!"
         )
     
+    @staticmethod
+    def album_received(image_count: int, pending_count: int) -> str:
+        """Album received confirmation"""
+        return (
+            f"✅ {image_count} images received!\n"
+            f"Images pending: {pending_count}\n\n"
+            f"Send more images or use /convert when ready!"
+        )
+    
     @staticmethod
     def processing_start(image_count: int, compression: CompressionLevel) -> str:
         """Processing started message"""
@@ -309,11 +535,12 @@ Send me some images to get started! 📸
         return "❌ Invalid image format. Please send a valid image."
     
     @staticmethod
-    def unsupported_format(file_extension: str, supported_formats: List[str]) -> str:
-        """Unsupported format message"""
+    @functools.lru_cache(maxsize=256)
+    def unsupported_format(file_extension: str, supported_formats: Iterable[str]) -> str:
+        """Unsupported format message; supported_formats must be hashable (tuple or frozenset)"""
         return (
             f"❌ Unsupported format: {file_extension}\n"
-            f"Supported formats: {', '.join(supported_formats)}"
+            f"Supported formats: {', '.join(sorted(supported_formats))}"
         )
 
     @staticmethod
@@ -334,6 +561,11 @@ Send me some images to get started! 📸
     def document_error(error_message: str) -> str:
         """Document conversion error message"""
         return f"❌ Document conversion failed: {error_message}"
+
+    @staticmethod
+    def file_too_large(max_size: str) -> str:
+        """File too large message"""
+        return f"❌ File is too large. Telegram bots can only download files up to {max_size}."
     
     @staticmethod
     def files_cleared() -> str:
@@ -366,33 +598,88 @@ Send me some images to get started! 📸
         return "Usage: /ocr_image [language]\nExample: /ocr_image eng\n\nLanguage is optional - defaults to English (eng) if not specified.\n\nSupported languages: eng (English), fra (French), deu (German), spa (Spanish), ita (Italian), por (Portuguese), rus (Russian), chi_sim (Chinese Simplified), jpn (Japanese)"
     
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def compression_set(compression: CompressionLevel) -> str:
         """Compression set message"""
-        return f"🔧 Compression set to **{compression.title}**"
+        return f"🔧 Compression set to {compression.title}"
 
 
 class ImageToPdfBot:
     """Refactored Telegram bot for converting images to PDF"""
     
+    # Bot menu commands, built once at class load and shared by /start and startup
+    BOT_COMMANDS: Final[Tuple[BotCommand, ...]] = tuple(
+        BotCommand(name, description) for name, description in COMMAND_DESCRIPTIONS
+    )
+    
     def __init__(self, token: str):
         self.token = token
         self.converter = ImageToPdfConverter()
         self.pdf_tools = PdfTools()
-        self.user_sessions: Dict[int, UserSession] = {}
+        self.doc_converter = DocumentToPdfConverter()
+        self.text_converter = TextToPdfConverter()
+        self.html_converter = HtmlToPdfConverter()
+        # Frozen once so rejecting an upload doesn't rebuild the union
+        self._all_supported_ext: Tuple[str, ...] = tuple(sorted(
+            self.doc_converter.supported_formats
+            | self.text_converter.supported_formats
+            | self.html_converter.supported_formats
+        ))
+        self.user_sessions = SessionStore(
+            max_sessions=int(os.getenv('BOT_MAX_SESSIONS', MAX_SESSIONS)),
+            ttl=int(os.getenv('SESSION_TTL', SESSION_TTL))
+        )
         self.debug_mode = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
         self.debug_dir = 'debug_output'
+        self._debug_dir_prefix = self.debug_dir + os.sep
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._buf_pool: queue.LifoQueue = queue.LifoQueue(maxsize=DOWNLOAD_BUFFER_COUNT)
+        for _ in range(DOWNLOAD_BUFFER_COUNT):
+            self._buf_pool.put_nowait(bytearray(DOWNLOAD_BUFFER_SIZE))
+        # CPU-bound conversions run in a process pool so they never hold the
+        # event loop (or the GIL); the semaphore caps work in flight
+        self._pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        self._cpu_sem = asyncio.Semaphore(os.cpu_count() or 1)
+        # Document conversions are funnelled through a fixed pool of workers
+        self.max_workers = int(os.getenv('CONVERSION_WORKERS', os.cpu_count() or 1))
+        self.conversion_queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        # Files awaiting deletion by the background cleanup task
+        self._cleanup_q: asyncio.Queue = asyncio.Queue()
+        # Album uploads waiting for their debounced summary reply
+        self._pending_groups: Dict[str, List[ImageInfo]] = {}
+        self._group_timers: Dict[str, asyncio.TimerHandle] = {}
+        self._background_tasks: set = set()
+        # Per-bot scratch directory; files inside are named from a counter
+        self._sweep_stale_scratch()
+        self.scratch_dir = tempfile.mkdtemp(prefix=f'{SCRATCH_PREFIX}{os.getpid()}_')
+        self._scratch_ids = itertools.count()
+        # Fallback for exits that skip post_shutdown; a no-op once it has run
+        atexit.register(shutil.rmtree, self.scratch_dir, True)
         
         # Create debug directory if in debug mode
         if self.debug_mode:
             os.makedirs(self.debug_dir, exist_ok=True)
         
-        logger.info(f"Bot initialized. Debug mode: {self.debug_mode}")
+        logger.info("Bot initialized. Debug mode: %s", self.debug_mode)
+        # Pillow-SIMD reports a ".postN" version; libjpeg-turbo speeds up JPEG decode either way
+        logger.info(
+            "Pillow %s (SIMD build: %s, libjpeg-turbo: %s)",
+            PIL.__version__, ".post" in PIL.__version__, pil_features.check_feature('libjpeg_turbo')
+        )
     
     def get_user_session(self, user_id: int) -> UserSession:
         """Get or create user session"""
-        if user_id not in self.user_sessions:
-            self.user_sessions[user_id] = UserSession(user_id)
-        return self.user_sessions[user_id]
+        return self.user_sessions.get(user_id)
+    
+    async def _sweep_sessions(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Periodic job: expire idle user sessions"""
+        expired = self.user_sessions.expire_idle()
+        if expired:
+            logger.info("Expired %s idle sessions (%s active)", expired, len(self.user_sessions))
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command"""
@@ -402,21 +689,7 @@ class ImageToPdfBot:
         except Exception:
             pass
         # Ensure global commands are set
-        await context.bot.set_my_commands([
-            BotCommand("start", "Start bot and see welcome message"),
-            BotCommand("help", "Show help message"),
-            BotCommand("convert", "Choose compression options"),
-            BotCommand("convert_now", "Convert with current settings"),
-            BotCommand("compress_high", "Set high quality compression (95%)"),
-            BotCommand("compress_medium", "Set medium quality compression (85%)"),
-            BotCommand("compress_low", "Set low quality compression (70%)"),
-            BotCommand("merge", "Merge pending PDFs"),
-            BotCommand("split", "Split last PDF into pages"),
-            BotCommand("compress_pdf", "Compress last PDF"),
-            BotCommand("url2pdf", "Convert a URL to PDF"),
-            BotCommand("ocr", "OCR last PDF"),
-            BotCommand("clear", "Clear all pending images")
-        ])
+        await context.bot.set_my_commands(self.BOT_COMMANDS)
         await update.message.reply_text(MessageTemplates.welcome())
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -426,8 +699,7 @@ class ImageToPdfBot:
     async def clear_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /clear command"""
         session = self.get_user_session(update.effective_user.id)
-        session.clear_temp_files()
-        session.clear_pdf_files()
+        self._release_files(session.take_temp_files() + session.take_pdf_files())
         await update.message.reply_text(MessageTemplates.files_cleared())
     
     async def set_compression(self, update: Update, context: ContextTypes.DEFAULT_TYPE, compression: CompressionLevel) -> None:
@@ -435,7 +707,7 @@ class ImageToPdfBot:
         session = self.get_user_session(update.effective_user.id)
         session.compression_setting = compression
         
-        await update.message.reply_text(MessageTemplates.compression_set(compression), parse_mode=ParseMode.MARKDOWN)
+        await update.message.reply_text(MessageTemplates.compression_set(compression))
         # Auto-convert after setting compression
         await self.convert_now_command(update, context)
     
@@ -483,34 +755,33 @@ class ImageToPdfBot:
         try:
             # Generate debug filename if in debug mode
             if self.debug_mode:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                debug_filename = f"user_{update.effective_user.id}_{timestamp}_{image_count}images.pdf"
-                debug_path = os.path.join(self.debug_dir, debug_filename)
+                timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+                debug_path = f"{self._debug_dir_prefix}user_{update.effective_user.id}_{timestamp}_{image_count}images.pdf"
                 
                 # Convert images to debug location
                 if image_count == 1:
-                    result = await self._convert_single_image(session.temp_files[0], debug_path, compression)
+                    result = await self._convert_single_image(session.temp_files[0], debug_path, compression, session.image_info)
                 else:
-                    result = await self._convert_multiple_images(session.temp_files, debug_path, compression)
+                    result = await self._convert_multiple_images(session.temp_files, debug_path, compression, session.image_info)
                 
-                logger.info(f"Debug mode: PDF saved to {debug_path}")
+                logger.info("Debug mode: PDF saved to %s", debug_path)
             else:
                 # Normal conversion
                 if image_count == 1:
-                    result = await self._convert_single_image(session.temp_files[0], compress=compression)
+                    result = await self._convert_single_image(session.temp_files[0], compress=compression, known_info=session.image_info)
                 else:
-                    result = await self._convert_multiple_images(session.temp_files, compress=compression)
+                    result = await self._convert_multiple_images(session.temp_files, compress=compression, known_info=session.image_info)
             
             # Send results
             await self._send_conversion_results(update, result, processing_message, image_count)
             
         except Exception as e:
-            logger.error(f"Error converting images: {e}")
+            logger.error("Error converting images: %s", e)
             await processing_message.edit_text(MessageTemplates.conversion_error(str(e)))
         
         finally:
             # Clean up temporary files
-            session.clear_temp_files()
+            self._release_files(session.take_temp_files())
 
     async def merge_pdfs_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Merge all pending PDFs into one"""
@@ -522,17 +793,16 @@ class ImageToPdfBot:
         with tempfile.TemporaryDirectory() as temp_dir:
             output_path = os.path.join(temp_dir, "merged.pdf")
             try:
-                merged_path = self.pdf_tools.merge_pdfs(session.pdf_files, output_path)
+                merged_path = await self._run_cpu(self.pdf_tools.merge_pdfs, list(session.pdf_files), output_path)
                 await update.message.reply_document(
-                    document=open(merged_path, "rb"),
-                    caption="✅ PDFs merged successfully!",
-                    parse_mode=ParseMode.MARKDOWN
+                    document=await self._read_output(merged_path),
+                    caption="✅ PDFs merged successfully!"
                 )
             except Exception as e:
-                logger.error(f"Error merging PDFs: {e}")
+                logger.error("Error merging PDFs: %s", e)
                 await update.message.reply_text(f"❌ Merge failed: {e}")
             finally:
-                session.clear_pdf_files()
+                self._release_files(session.take_pdf_files())
 
     async def split_pdf_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Split the last received PDF into one file per page"""
@@ -545,18 +815,24 @@ class ImageToPdfBot:
         with tempfile.TemporaryDirectory() as temp_dir:
             output_prefix = os.path.join(temp_dir, "split")
             try:
-                outputs = self.pdf_tools.split_pdf(source_pdf, output_prefix=output_prefix)
-                for out_path in outputs:
-                    await update.message.reply_document(
-                        document=open(out_path, "rb"),
-                        caption="✅ Split page",
-                        parse_mode=ParseMode.MARKDOWN
-                    )
+                outputs = await self._run_cpu(self.pdf_tools.split_pdf, source_pdf, output_prefix=output_prefix)
+                # Telegram takes up to 10 documents per album, so send pages in batches
+                for start in range(0, len(outputs), MEDIA_GROUP_LIMIT):
+                    batch = outputs[start:start + MEDIA_GROUP_LIMIT]
+                    files = await asyncio.gather(*(self._read_output(path) for path in batch))
+                    caption = f"✅ Split pages {start + 1}-{start + len(batch)} of {len(outputs)}"
+                    # An album needs at least two items; a lone page goes as a plain document
+                    if len(files) == 1:
+                        await update.message.reply_document(document=files[0], caption=caption)
+                    else:
+                        media = [InputMediaDocument(media=f) for f in files[:-1]]
+                        media.append(InputMediaDocument(media=files[-1], caption=caption))
+                        await update.message.reply_media_group(media=media)
             except Exception as e:
-                logger.error(f"Error splitting PDF: {e}")
+                logger.error("Error splitting PDF: %s", e)
                 await update.message.reply_text(f"❌ Split failed: {e}")
             finally:
-                session.clear_pdf_files()
+                self._release_files(session.take_pdf_files())
 
     async def compress_pdf_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Compress the last received PDF"""
@@ -573,23 +849,22 @@ class ImageToPdfBot:
             output_path = os.path.join(temp_dir, "compressed.pdf")
             try:
                 original_size = os.path.getsize(source_pdf)
-                compressed_path = self.pdf_tools.compress_pdf(source_pdf, output_path, profile=profile)
+                compressed_path = await self._run_cpu(self.pdf_tools.compress_pdf, source_pdf, output_path, profile=profile)
                 compressed_size = os.path.getsize(compressed_path)
                 await update.message.reply_document(
-                    document=open(compressed_path, "rb"),
+                    document=await self._read_output(compressed_path),
                     caption=(
                         "✅ PDF compressed successfully!\n"
                         f"Original: {self.converter.format_file_size(original_size)}\n"
                         f"Compressed: {self.converter.format_file_size(compressed_size)}\n"
                         f"Profile: {profile}"
-                    ),
-                    parse_mode=ParseMode.MARKDOWN
+                    )
                 )
             except Exception as e:
-                logger.error(f"Error compressing PDF: {e}")
+                logger.error("Error compressing PDF: %s", e)
                 await update.message.reply_text(f"❌ Compression failed: {e}")
             finally:
-                session.clear_pdf_files()
+                self._release_files(session.take_pdf_files())
 
     async def url_to_pdf_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Convert a URL to PDF"""
@@ -601,14 +876,13 @@ class ImageToPdfBot:
         with tempfile.TemporaryDirectory() as temp_dir:
             output_path = os.path.join(temp_dir, "webpage.pdf")
             try:
-                result = self.html_converter.convert_url(url, output_path)
+                result = await self._run_cpu(self.html_converter.convert_url, url, output_path)
                 await update.message.reply_document(
-                    document=open(result["pdf_path"], "rb"),
-                    caption="✅ URL converted to PDF!",
-                    parse_mode=ParseMode.MARKDOWN
+                    document=await self._read_output(result["pdf_path"]),
+                    caption="✅ URL converted to PDF!"
                 )
             except Exception as e:
-                logger.error(f"Error converting URL: {e}")
+                logger.error("Error converting URL: %s", e)
                 await update.message.reply_text(f"❌ URL conversion failed: {e}")
 
     async def ocr_pdf_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -626,17 +900,16 @@ class ImageToPdfBot:
         with tempfile.TemporaryDirectory() as temp_dir:
             output_path = os.path.join(temp_dir, "ocr.pdf")
             try:
-                ocr_path = self.pdf_tools.ocr_pdf(source_pdf, output_path, language=language)
+                ocr_path = await self._run_cpu(self.pdf_tools.ocr_pdf, source_pdf, output_path, language=language)
                 await update.message.reply_document(
-                    document=open(ocr_path, "rb"),
-                    caption="✅ OCR completed!",
-                    parse_mode=ParseMode.MARKDOWN
+                    document=await self._read_output(ocr_path),
+                    caption="✅ OCR completed!"
                 )
             except Exception as e:
-                logger.error(f"Error running OCR: {e}")
+                logger.error("Error running OCR: %s", e)
                 await update.message.reply_text(f"❌ OCR failed: {e}")
             finally:
-                session.clear_pdf_files()
+                self._release_files(session.take_pdf_files())
     
     async def ocr_image_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Run OCR on the last received image"""
@@ -657,34 +930,44 @@ class ImageToPdfBot:
             processing_message = await update.message.reply_text("🔍 Performing OCR on image...")
             
             # Perform OCR on the image
-            extracted_text = self.converter.ocr_image(source_image, language)
+            extracted_text = await self._run_cpu(self.converter.ocr_image, source_image, language)
             
             if extracted_text.strip():
                 # Send extracted text
-                if len(extracted_text) > 4000:  # Telegram message limit
-                    # Split long text into chunks
-                    chunks = [extracted_text[i:i+4000] for i in range(0, len(extracted_text), 4000)]
+                if len(extracted_text) > MESSAGE_CHUNK_SIZE:  # Telegram message limit
+                    # Slice chunks lazily instead of materialising them all up front
+                    total = -(-len(extracted_text) // MESSAGE_CHUNK_SIZE)
                     await processing_message.edit_text("✅ OCR completed! Text extracted:")
                     
-                    for i, chunk in enumerate(chunks, 1):
-                        await update.message.reply_text(f"📄 Part {i}/{len(chunks)}:\n\n{chunk}")
+                    for i, start in enumerate(range(0, len(extracted_text), MESSAGE_CHUNK_SIZE), 1):
+                        chunk = extracted_text[start:start + MESSAGE_CHUNK_SIZE]
+                        await update.message.reply_text(f"📄 Part {i}/{total}:\n\n{chunk}")
                 else:
                     await processing_message.edit_text(f"✅ OCR completed!\n\n📄 Extracted text:\n\n{extracted_text}")
             else:
                 await processing_message.edit_text("✅ OCR completed, but no text was found in the image.")
                 
         except Exception as e:
-            logger.error(f"Error running OCR on image: {e}")
+            logger.error("Error running OCR on image: %s", e)
             await update.message.reply_text(f"❌ OCR failed: {e}")
         finally:
             # Clean up temporary files
-            session.clear_temp_files()
+            self._release_files(session.take_temp_files())
     
-    async def _convert_single_image(self, image_path: str, output_path: Optional[str] = None, compress: CompressionLevel = CompressionLevel.MEDIUM) -> ConversionResult:
+    async def _convert_single_image(self, image_path: str, output_path: Optional[str] = None, compress: CompressionLevel = CompressionLevel.MEDIUM,
+                                    known_info: Optional[Dict[str, ImageInfo]] = None) -> ConversionResult:
         """Convert single image to PDF"""
+        if output_path is None:
+            output_path = self._alloc_scratch('.pdf')
+        scaled_copies: List[str] = []
         try:
-            # Run the synchronous conversion method
-            result_dict = self.converter.convert_single_image(image_path, output_path, compress.value if compress else None)
+            source_path = await self._downscale_for_conversion(image_path, compress, known_info, scaled_copies)
+            # Run the conversion in the process pool
+            result_dict = await self._run_cpu(
+                self.converter.convert_single_image,
+                source_path, output_path, compress.value if compress else None, return_bytes=True,
+                image_info=self._converter_image_info(known_info, source_path)
+            )
             return ConversionResult(
                 success=True,
                 pdf_path=result_dict['pdf_path'],
@@ -692,113 +975,212 @@ class ImageToPdfBot:
                 pdf_size=result_dict.get('pdf_size'),
                 compression_used=compress,
                 original_format=result_dict.get('original_format'),
-                image_dimensions=result_dict.get('image_dimensions')
+                image_dimensions=result_dict.get('image_dimensions'),
+                pdf_bytes=self._small_pdf_bytes(result_dict)
             )
         except Exception as e:
-            logger.error(f"Error converting single image: {e}")
+            logger.error("Error converting single image: %s", e)
             return ConversionResult(success=False, error_message=str(e))
+        finally:
+            self._release_files(scaled_copies)
     
-    async def _convert_multiple_images(self, image_paths: List[str], output_path: Optional[str] = None, compress: CompressionLevel = CompressionLevel.MEDIUM) -> ConversionResult:
-        """Convert multiple images to PDF"""
+    async def _convert_multiple_images(self, image_paths: List[str], output_path: Optional[str] = None, compress: CompressionLevel = CompressionLevel.MEDIUM,
+                                       known_info: Optional[Dict[str, ImageInfo]] = None) -> ConversionResult:
+        """Convert multiple images to PDF, rendering pages in parallel and merging them"""
+        if output_path is None:
+            output_path = self._alloc_scratch('.pdf')
+        quality = compress.value if compress else None
+        page_paths = [self._alloc_scratch('.pdf') for _ in image_paths]
+        scaled_copies: List[str] = []
+        
+        async def convert_page(image_path: str, page_path: str) -> dict:
+            source_path = await self._downscale_for_conversion(image_path, compress, known_info, scaled_copies)
+            return await self._run_cpu(
+                self.converter.convert_single_image, source_path, page_path, quality,
+                image_info=self._converter_image_info(known_info, source_path)
+            )
+        
         try:
-            # Run synchronous conversion method
-            result_dict = self.converter.convert_multiple_images(image_paths, output_path, compress.value if compress else None)
+            # Each page is encoded independently, so spread them across the process pool
+            pages = await asyncio.gather(
+                *(
+                    convert_page(image_path, page_path)
+                    for image_path, page_path in zip(image_paths, page_paths)
+                ),
+                return_exceptions=True
+            )
+            for page in pages:
+                if isinstance(page, BaseException):
+                    raise page
+            
+            merged_path = await self._run_cpu(self.pdf_tools.merge_pdfs, page_paths, output_path)
+            total_original_size = await asyncio.to_thread(
+                lambda: sum(os.path.getsize(path) for path in image_paths)
+            )
+            pdf_size = await asyncio.to_thread(os.path.getsize, merged_path)
             return ConversionResult(
                 success=True,
-                pdf_path=result_dict['pdf_path'],
-                total_original_size=result_dict.get('total_original_size'),
-                pdf_size=result_dict.get('pdf_size'),
+                pdf_path=merged_path,
+                total_original_size=self.converter.format_file_size(total_original_size),
+                pdf_size=self.converter.format_file_size(pdf_size),
                 compression_used=compress,
-                image_count=result_dict.get('image_count')
+                image_count=len(image_paths)
             )
         except Exception as e:
-            logger.error(f"Error converting multiple images: {e}")
+            logger.error("Error converting multiple images: %s", e)
             return ConversionResult(success=False, error_message=str(e))
+        finally:
+            self._release_files(page_paths)
+            self._release_files(scaled_copies)
+    
+    async def _downscale_for_conversion(self, image_path: str, compress: Optional[CompressionLevel],
+                                        known_info: Optional[Dict[str, ImageInfo]],
+                                        scaled_copies: List[str]) -> str:
+        """Return a shrunk scratch copy of an oversized image below high quality, else the original"""
+        # The upload itself is never modified, so a later /compress_high still gets full resolution
+        if compress is None or compress == CompressionLevel.HIGH:
+            return image_path
+        info = known_info.get(image_path) if known_info else None
+        if info is not None and info.pixel_size is not None and max(info.pixel_size) <= CONVERSION_MAX_SIDE:
+            return image_path
+        scaled_path = self._alloc_scratch('.jpg')
+        try:
+            resized = await self._run_cpu(
+                self.converter.downscale_image, image_path, CONVERSION_MAX_SIDE, output_path=scaled_path
+            )
+        except Exception as e:
+            # The original is still usable, just slower to convert
+            logger.warning("Could not downscale %s: %s", image_path, e)
+            self._release_files([scaled_path])
+            return image_path
+        if not resized:
+            return image_path
+        scaled_copies.append(scaled_path)
+        return scaled_path
+    
+    @staticmethod
+    def _converter_image_info(known_info: Optional[Dict[str, ImageInfo]], image_path: str) -> Optional[dict]:
+        """Metadata recorded at upload in the shape the converter's own probe returns"""
+        info = known_info.get(image_path) if known_info else None
+        if info is None or info.pixel_size is None:
+            return None
+        return {'format': info.format, 'size': info.pixel_size}
+    
+    @staticmethod
+    def _small_pdf_bytes(result_dict: dict) -> Optional[bytes]:
+        """Keep converted PDF bytes only when they are small enough to hold in memory"""
+        pdf_bytes = result_dict.get('pdf_bytes')
+        if pdf_bytes is not None and len(pdf_bytes) <= PDF_MEMORY_LIMIT:
+            return pdf_bytes
+        return None
+    
+    @staticmethod
+    async def _read_output(path: str) -> InputFile:
+        """Read a generated file without blocking the event loop"""
+        # PTB's InputFile reads file objects whole anyway, so read it here asynchronously
+        async with aiofiles.open(path, 'rb') as f:
+            data = await f.read()
+        return InputFile(data, filename=os.path.basename(path))
     
     async def _send_conversion_results(self, update: Update, result: ConversionResult, processing_message, image_count: int) -> None:
-        """Send conversion results to user"""
+        """Send conversion results to user as a single document with a combined caption"""
         if not result.success:
             await processing_message.edit_text(MessageTemplates.conversion_error(result.error_message))
             return
         
+        caption = (
+            f"{MessageTemplates.conversion_success(result, image_count)}\n\n"
+            f"{MessageTemplates.file_size_info(result)}"
+        )
+        if self.debug_mode:
+            caption += f"\n\n📁 Debug mode: PDF saved to `{result.pdf_path}`"
+        
         try:
-            # Send PDF file with timeout
+            # Send PDF file with timeout, reusing the in-memory PDF when available
+            if result.pdf_bytes is not None:
+                document = InputFile(result.pdf_bytes, filename=os.path.basename(result.pdf_path))
+            else:
+                # PTB reads a file object synchronously, so read it off the event loop first
+                document = await self._read_output(result.pdf_path)
             await asyncio.wait_for(
                 update.message.reply_document(
-                    document=open(result.pdf_path, 'rb'),
-                    caption=MessageTemplates.conversion_success(result, image_count),
+                    document=document,
+                    caption=caption,
                     parse_mode=ParseMode.MARKDOWN
                 ),
                 timeout=60.0  # Increased to 60 seconds
             )
         except asyncio.TimeoutError:
-            logger.error(f"Timeout sending PDF document: {result.pdf_path}")
-            await processing_message.edit_text("❌ Upload timed out. The PDF was created successfully and saved to debug output. Please check the debug directory.")
+            logger.error("Timeout sending PDF document: %s", result.pdf_path)
+            if self.debug_mode:
+                await processing_message.edit_text(f"❌ Upload timed out. The PDF was saved to {result.pdf_path}.")
+            else:
+                # The PDF is deleted below, along with the uploaded images
+                await processing_message.edit_text("❌ Upload timed out. Please send your images again and retry.")
             return
         except Exception as e:
-            logger.error(f"Error sending PDF document: {e}")
+            logger.error("Error sending PDF document: %s", e)
             await processing_message.edit_text(f"❌ Error sending PDF: {str(e)}")
             return
+        finally:
+            # Clean up PDF file after sending (only if not in debug mode)
+            if not self.debug_mode:
+                self._cleanup_q.put_nowait(result.pdf_path)
         
+        # The document caption now carries the status, so drop the progress message
+        self._spawn(self._delete_quietly(processing_message))
+    
+    def _spawn(self, coro) -> None:
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    @staticmethod
+    async def _delete_quietly(message) -> None:
+        """Delete a message, ignoring failures"""
         try:
-            # Update processing message
-            await asyncio.wait_for(
-                processing_message.edit_text(MessageTemplates.conversion_success(result, image_count)),
-                timeout=10.0  # 10 second timeout
-            )
-        except asyncio.TimeoutError:
-            logger.error("Timeout updating processing message")
-            # Don't fail the whole process if just the message update times out
-            pass
-        except Exception as e:
-            logger.error(f"Error updating processing message: {e}")
-        
-        try:
-            # Send file size info
-            await asyncio.wait_for(
-                update.message.reply_text(MessageTemplates.file_size_info(result), parse_mode=ParseMode.MARKDOWN),
-                timeout=10.0  # 10 second timeout
-            )
-        except asyncio.TimeoutError:
-            logger.error("Timeout sending file size info")
-            pass
+            await message.delete()
         except Exception as e:
-            logger.error(f"Error sending file size info: {e}")
-        
-        # Clean up PDF file after sending (only if not in debug mode)
-        if not self.debug_mode:
-            os.unlink(result.pdf_path)
-        else:
-            await update.message.reply_text(f"📁 Debug mode: PDF saved to {result.pdf_path}")
+            logger.error("Error deleting processing message: %s", e)
     
     async def handle_image(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle incoming images"""
         session = self.get_user_session(update.effective_user.id)
         
-        # Get the largest photo available
-        photo = update.message.photo[-1]
+        message = update.message
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.jpg') as temp_file:
-            # Download photo
-            file = await context.bot.get_file(photo.file_id)
-            await file.download_to_drive(temp_file.name)
-            
-            # Store temp file path
-            session.add_temp_file(temp_file.name)
-            
-            # Get image info
-            img_info = self._get_image_info(temp_file.name)
-            if img_info:
-                await update.message.reply_text(
-                    MessageTemplates.image_received(img_info, session.get_file_count()),
-                    parse_mode=ParseMode.MARKDOWN
-                )
-            else:
-                await update.message.reply_text(MessageTemplates.invalid_image())
-                # Clean up invalid file
-                os.unlink(temp_file.name)
-                session.temp_files.remove(temp_file.name)
+        # Get the largest photo available; PTB orders sizes smallest first
+        photo = message.photo[-1]
+        
+        # Telegram re-encodes photos as JPEG and reports their metadata, so no probe is needed
+        temp_path = await self._download_file(context, photo.file_id, '.jpg')
+        img_info = ImageInfo(
+            file_path=temp_path,
+            size=self.converter.format_file_size(photo.file_size or os.path.getsize(temp_path)),
+            format='JPEG',
+            dimensions=f"{photo.width}x{photo.height}",
+            pixel_size=(photo.width, photo.height)
+        )
+        session.add_temp_file(temp_path, img_info)
+        await self._acknowledge_image(update, session, img_info)
+    
+    async def _receive_image_in_memory(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                       session: UserSession, file_id: str, suffix: str) -> None:
+        """Download an image into memory, probe it there and write it to disk only if valid"""
+        file = await context.bot.get_file(file_id)
+        data = await file.download_as_bytearray()
+        temp_path = self._alloc_scratch(suffix)
+        
+        # Get image info
+        async with self._cpu_sem:
+            img_info = await asyncio.to_thread(self._get_image_info_from_bytes, data, temp_path, len(data))
+        if img_info:
+            await asyncio.to_thread(Path(temp_path).write_bytes, data)
+            session.add_temp_file(temp_path, img_info)
+            await self._acknowledge_image(update, session, img_info)
+        else:
+            await update.message.reply_text(MessageTemplates.invalid_image())
     
     async def handle_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle document uploads (images sent as files)"""
@@ -811,86 +1193,129 @@ class ImageToPdfBot:
             return
         
         # Get file extension
-        file_extension = Path(document.file_name).suffix.lower()
+        file_extension = os.path.splitext(document.file_name or '')[1].lower()
         if file_extension not in self.converter.supported_formats:
             await update.message.reply_text(
                 MessageTemplates.unsupported_format(file_extension, self.converter.supported_formats)
             )
             return
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-            # Download document
-            file = await context.bot.get_file(document.file_id)
-            await file.download_to_drive(temp_file.name)
-            
-            # Store temp file path
-            session.add_temp_file(temp_file.name)
-            
-            # Get image info
-            img_info = self._get_image_info(temp_file.name)
-            if img_info:
-                await update.message.reply_text(
-                    MessageTemplates.image_received(img_info, session.get_file_count()),
-                    parse_mode=ParseMode.MARKDOWN
-                )
-            else:
-                await update.message.reply_text(MessageTemplates.invalid_image())
-                # Clean up invalid file
-                os.unlink(temp_file.name)
-                session.temp_files.remove(temp_file.name)
-
-    async def handle_non_image_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        """Handle non-image documents (Office and text/markdown)"""
-        document = update.message.document
-
-        if not document or not document.file_name:
-            await update.message.reply_text("❌ Invalid document.")
+        if not await self._check_download_size(update, document.file_size):
             return
-
-        file_extension = Path(document.file_name).suffix.lower()
-        if file_extension == ".pdf":
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                file = await context.bot.get_file(document.file_id)
-                await file.download_to_drive(temp_file.name)
-                session = self.get_user_session(update.effective_user.id)
-                session.add_pdf_file(temp_file.name)
-                await update.message.reply_text(
-                    MessageTemplates.pdf_received(document.file_name, session.get_pdf_count())
-                )
+        
+        # Images that fit a single-stream download are probed straight from memory
+        if document.file_size and document.file_size < PARALLEL_DOWNLOAD_THRESHOLD:
+            await self._receive_image_in_memory(update, context, session, document.file_id, file_extension)
             return
-
-        converter = None
-        if file_extension in self.doc_converter.supported_formats:
-            converter = self.doc_converter
-        elif file_extension in self.text_converter.supported_formats:
-            converter = self.text_converter
-        elif file_extension in self.html_converter.supported_formats:
-            converter = self.html_converter
+        
+        # Download document to a temporary file while probing its header in parallel
+        file = await context.bot.get_file(document.file_id)
+        temp_path = self._alloc_scratch(file_extension)
+        # A failed download cancels the probe rather than leaving it running
+        _, img_info = await self._gather_or_cancel((
+            self._download_telegram_file(file, dest=temp_path),
+            self._probe_image_head(file.file_path, temp_path, document.file_size)
+        ))
+        
+        # Formats whose metadata isn't in the first bytes need the full file
+        if img_info is None:
+            async with self._cpu_sem:
+                img_info = await asyncio.to_thread(self._get_image_info, temp_path)
+        if img_info:
+            # Store temp file path only once the image is known to be valid
+            session.add_temp_file(temp_path, img_info)
+            await self._acknowledge_image(update, session, img_info)
         else:
-            supported = list(
-                self.doc_converter.supported_formats
-                | self.text_converter.supported_formats
-                | self.html_converter.supported_formats
+            await update.message.reply_text(MessageTemplates.invalid_image())
+            # Clean up invalid file
+            self._cleanup_q.put_nowait(temp_path)
+
+    async def _acknowledge_image(self, update: Update, session: UserSession, img_info: ImageInfo) -> None:
+        """Confirm a received image, folding album uploads into one summary reply"""
+        group_id = update.message.media_group_id
+        if group_id is None:
+            await update.message.reply_text(
+                MessageTemplates.image_received(img_info, session.get_file_count())
             )
+            return
+        
+        self._pending_groups.setdefault(group_id, []).append(img_info)
+        timer = self._group_timers.pop(group_id, None)
+        if timer is not None:
+            timer.cancel()
+        self._group_timers[group_id] = asyncio.get_running_loop().call_later(
+            MEDIA_GROUP_DEBOUNCE, self._schedule_group_flush, group_id, update, session
+        )
+    
+    def _schedule_group_flush(self, group_id: str, update: Update, session: UserSession) -> None:
+        """Timer callback: send the album summary once no more photos arrive"""
+        self._spawn(self._flush_media_group(group_id, update, session))
+    
+    async def _flush_media_group(self, group_id: str, update: Update, session: UserSession) -> None:
+        """Send one reply covering every image received in an album"""
+        self._group_timers.pop(group_id, None)
+        received = self._pending_groups.pop(group_id, [])
+        if not received:
+            return
+        try:
             await update.message.reply_text(
-                MessageTemplates.unsupported_format(file_extension, supported)
+                MessageTemplates.album_received(len(received), session.get_file_count())
             )
+        except Exception as e:
+            logger.error("Error acknowledging album: %s", e)
+    
+    async def handle_pdf_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Queue an uploaded PDF for the PDF tools"""
+        document = update.message.document
+        if not await self._check_download_size(update, document.file_size):
+            return
+        
+        temp_path = await self._download_file(context, document.file_id, suffix=".pdf")
+        session = self.get_user_session(update.effective_user.id)
+        session.add_pdf_file(temp_path)
+        await update.message.reply_text(
+            MessageTemplates.pdf_received(document.file_name or "document.pdf", session.get_pdf_count())
+        )
+    
+    async def handle_office_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Convert an uploaded Office document to PDF"""
+        await self._convert_uploaded_document(update, context, self.doc_converter.convert_document)
+    
+    async def handle_text_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Convert an uploaded text/markdown file to PDF"""
+        await self._convert_uploaded_document(update, context, self.text_converter.convert_text)
+    
+    async def handle_html_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Convert an uploaded HTML file to PDF"""
+        await self._convert_uploaded_document(update, context, self.html_converter.convert_html_file)
+    
+    async def handle_unsupported_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Reply to documents no converter accepts"""
+        document = update.message.document
+        file_extension = os.path.splitext(document.file_name or '')[1].lower()
+        await update.message.reply_text(
+            MessageTemplates.unsupported_format(file_extension, self._all_supported_ext)
+        )
+    
+    async def _convert_uploaded_document(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                                         convert: Callable[[str, str], dict]) -> None:
+        """Download a document, convert it with the given converter and send the PDF back"""
+        document = update.message.document
+        if not await self._check_download_size(update, document.file_size):
             return
 
         await update.message.reply_text(MessageTemplates.document_received(document.file_name))
 
         with tempfile.TemporaryDirectory() as temp_dir:
             doc_path = os.path.join(temp_dir, document.file_name)
-            file = await context.bot.get_file(document.file_id)
-            await file.download_to_drive(doc_path)
+            await self._download_file(context, document.file_id, dest=doc_path)
 
             try:
-                output_pdf = os.path.join(temp_dir, f"{Path(document.file_name).stem}.pdf")
+                output_pdf = os.path.join(temp_dir, f"{os.path.splitext(document.file_name)[0]}.pdf")
                 # Handle document conversion
-                result = self.pdf_tools.convert_document_to_pdf(doc_path, output_pdf)
+                result = await self._run_conversion(convert, doc_path, output_pdf)
             except Exception as e:
-                logger.error(f"Error processing document: {e}")
+                logger.error("Error processing document: %s", e)
                 await update.message.reply_text(f"❌ Error processing document: {str(e)}")
                 return
             else:
@@ -898,34 +1323,327 @@ class ImageToPdfBot:
                 pdf_size = self.converter.format_file_size(result["pdf_size"])
                 
                 await update.message.reply_document(
-                    document=open(result["pdf_path"], "rb"),
-                    caption="✅ Document converted to PDF!",
-                    parse_mode=ParseMode.MARKDOWN
+                    document=await self._read_output(result["pdf_path"]),
+                    caption="✅ Document converted to PDF!"
                 )
                 
                 await update.message.reply_text(
-                    MessageTemplates.document_success(original_size, pdf_size),
-                    parse_mode=ParseMode.MARKDOWN
+                    MessageTemplates.document_success(original_size, pdf_size)
                 )
     
+    async def _run_cpu(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking, CPU-bound call in the process pool"""
+        async with self._cpu_sem:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+    
+    async def _run_conversion(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Queue a blocking conversion for the worker pool and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self.conversion_queue.put_nowait(ConversionJob(fn, args, future))
+        return await future
+    
+    async def _conversion_worker(self) -> None:
+        """Run queued conversions one at a time in the process pool"""
+        while True:
+            job = await self.conversion_queue.get()
+            try:
+                result = await self._run_cpu(job.fn, *job.args)
+            except Exception as e:
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self.conversion_queue.task_done()
+    
+    async def _post_init(self, application: Application) -> None:
+        """Start background workers and register bot commands before polling begins"""
+        await self._start_workers(application)
+        if application.job_queue is not None:
+            application.job_queue.run_repeating(
+                self._sweep_sessions, interval=SESSION_SWEEP_INTERVAL, first=SESSION_SWEEP_INTERVAL
+            )
+        await self.set_bot_commands(application)
+    
+    async def _start_workers(self, application: Application) -> None:
+        """Start the conversion worker pool once the event loop is running"""
+        self._workers = [
+            asyncio.create_task(self._conversion_worker())
+            for _ in range(self.max_workers)
+        ]
+        self._workers.append(asyncio.create_task(self._cleanup_worker()))
+        logger.info("Started %s conversion workers", self.max_workers)
+    
+    async def _cleanup_worker(self) -> None:
+        """Delete queued files in batches off the event loop"""
+        while True:
+            batch = [await self._cleanup_q.get()]
+            while len(batch) < CLEANUP_BATCH_SIZE:
+                try:
+                    batch.append(self._cleanup_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            await asyncio.to_thread(self._remove_files, batch)
+            for _ in batch:
+                self._cleanup_q.task_done()
+    
+    def _release_files(self, paths: List[str]) -> None:
+        """Hand files to the background cleanup task instead of unlinking on the event loop"""
+        for path in paths:
+            self._cleanup_q.put_nowait(path)
+    
+    def _alloc_scratch(self, suffix: str = '') -> str:
+        """Reserve a unique path in the scratch directory"""
+        return os.path.join(self.scratch_dir, f"{next(self._scratch_ids)}{suffix}")
+    
+    async def _shutdown(self, application: Application) -> None:
+        """Release resources held across requests"""
+        # Stop everything that could still touch the scratch directory or the pool
+        for timer in self._group_timers.values():
+            timer.cancel()
+        self._group_timers.clear()
+        self._pending_groups.clear()
+        tasks = [*self._workers, *self._background_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        
+        pending = []
+        while not self._cleanup_q.empty():
+            pending.append(self._cleanup_q.get_nowait())
+        await asyncio.to_thread(self._remove_files, pending)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        # Queued jobs are dropped; one already running in a child process is waited
+        # for so it can't write into the scratch directory after it is removed
+        await asyncio.to_thread(self._pool.shutdown, wait=True, cancel_futures=True)
+        await asyncio.to_thread(shutil.rmtree, self.scratch_dir, True)
+    
+    @staticmethod
+    def _sweep_stale_scratch() -> None:
+        """Remove scratch directories left behind by bot processes that are gone"""
+        # The liveness probe relies on POSIX kill(pid, 0); on Windows os.kill terminates
+        if os.name != 'posix':
+            return
+        own_pid = os.getpid()
+        with os.scandir(tempfile.gettempdir()) as entries:
+            for entry in entries:
+                if not entry.name.startswith(SCRATCH_PREFIX) or not entry.is_dir(follow_symlinks=False):
+                    continue
+                pid_part = entry.name[len(SCRATCH_PREFIX):].partition('_')[0]
+                if not pid_part.isdigit():
+                    continue
+                pid = int(pid_part)
+                # Our own pid here means a previous run reused it, e.g. PID 1 in a container
+                if pid != own_pid:
+                    try:
+                        os.kill(pid, 0)
+                        continue
+                    except ProcessLookupError:
+                        pass
+                    except PermissionError:
+                        # Alive, owned by another user
+                        continue
+                logger.info("Removing stale scratch directory %s", entry.path)
+                shutil.rmtree(entry.path, ignore_errors=True)
+    
+    async def _check_download_size(self, update: Update, file_size: Optional[int]) -> bool:
+        """Reject uploads the Bot API won't let us download, before calling getFile"""
+        if file_size and file_size > MAX_DOWNLOAD_SIZE:
+            await update.message.reply_text(
+                MessageTemplates.file_too_large(self.converter.format_file_size(MAX_DOWNLOAD_SIZE))
+            )
+            return False
+        return True
+    
+    async def _download_file(self, context: ContextTypes.DEFAULT_TYPE, file_id: str,
+                             suffix: str = '', dest: Optional[str] = None) -> str:
+        """Download a Telegram file without blocking the event loop on disk I/O"""
+        file = await context.bot.get_file(file_id)
+        return await self._download_telegram_file(file, suffix, dest)
+    
+    async def _download_telegram_file(self, file, suffix: str = '', dest: Optional[str] = None) -> str:
+        """Download an already resolved Telegram file to disk"""
+        if file.file_size and file.file_size >= PARALLEL_DOWNLOAD_THRESHOLD:
+            try:
+                return await self._download_parallel(file, suffix, dest)
+            except (httpx.HTTPError, ValueError) as e:
+                # Range requests refused or throttled; fall back to one stream
+                logger.warning("Parallel download failed (%s), using single stream", type(e).__name__)
+        
+        if dest is None:
+            dest = self._alloc_scratch(suffix)
+        
+        try:
+            await self._download_stream(file.file_path, dest)
+        except Exception:
+            await asyncio.to_thread(self._remove_quietly, dest)
+            raise
+        return dest
+    
+    async def _probe_image_head(self, url: str, image_path: str, file_size: int) -> Optional[ImageInfo]:
+        """Read image metadata from the first bytes of a remote file"""
+        head = bytearray()
+        try:
+            async with self._get_http_client().stream(
+                'GET', url, headers={'Range': f'bytes=0-{IMAGE_HEAD_PROBE_SIZE - 1}'}
+            ) as response:
+                if response.status_code not in (200, 206):
+                    return None
+                # A server that ignores Range answers 200 with the whole file;
+                # stop reading once the header bytes are in
+                async for chunk in response.aiter_bytes():
+                    head += chunk
+                    if len(head) >= IMAGE_HEAD_PROBE_SIZE:
+                        break
+        except httpx.HTTPError:
+            return None
+        head = bytes(head[:IMAGE_HEAD_PROBE_SIZE])
+        async with self._cpu_sem:
+            return await asyncio.to_thread(self._get_image_info_from_bytes, head, image_path, file_size, True)
+    
+    async def _download_stream(self, url: str, dest: str) -> None:
+        """Stream a file to disk, batching network chunks through a pooled buffer"""
+        try:
+            buf = self._buf_pool.get_nowait()
+        except queue.Empty:
+            buf = bytearray(DOWNLOAD_BUFFER_SIZE)
+        
+        try:
+            async with self._get_http_client().stream('GET', url) as response:
+                response.raise_for_status()
+                async with aiofiles.open(dest, 'wb') as f:
+                    filled = 0
+                    async for chunk in response.aiter_bytes():
+                        view = memoryview(chunk)
+                        while view:
+                            n = min(len(view), DOWNLOAD_BUFFER_SIZE - filled)
+                            buf[filled:filled + n] = view[:n]
+                            filled += n
+                            view = view[n:]
+                            if filled == DOWNLOAD_BUFFER_SIZE:
+                                await f.write(buf)
+                                filled = 0
+                    if filled:
+                        await f.write(memoryview(buf)[:filled])
+        finally:
+            try:
+                self._buf_pool.put_nowait(buf)
+            except queue.Full:
+                pass
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Shared HTTP client for direct file downloads"""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=60.0)
+        return self._http_client
+    
+    async def _download_parallel(self, file, suffix: str, dest: Optional[str]) -> str:
+        """Fetch a large file as concurrent byte ranges written in place"""
+        client = self._get_http_client()
+        size = file.file_size
+        semaphore = asyncio.Semaphore(PARALLEL_DOWNLOAD_WORKERS)
+        
+        if dest is None:
+            dest = self._alloc_scratch(suffix)
+        fd = await asyncio.to_thread(os.open, dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        
+        async def fetch_range(start: int) -> None:
+            end = min(start + PARALLEL_DOWNLOAD_CHUNK, size) - 1
+            async with semaphore:
+                async with client.stream('GET', file.file_path, headers={'Range': f'bytes={start}-{end}'}) as response:
+                    # Check before reading: a server that ignores Range sends the whole file
+                    content_range = response.headers.get('Content-Range', '')
+                    if response.status_code != 206 or not content_range.startswith(f'bytes {start}-{end}/'):
+                        raise ValueError(f"Range request returned HTTP {response.status_code}")
+                    body = await response.aread()
+            if len(body) != end - start + 1:
+                raise ValueError(f"Range {start}-{end} returned {len(body)} bytes")
+            await asyncio.to_thread(os.pwrite, fd, body, start)
+        
+        try:
+            await asyncio.to_thread(self._preallocate, fd, size)
+            # Probe with the first range alone; fan out only once ranges are known to work
+            await fetch_range(0)
+            await self._gather_or_cancel(
+                fetch_range(start) for start in range(PARALLEL_DOWNLOAD_CHUNK, size, PARALLEL_DOWNLOAD_CHUNK)
+            )
+        except BaseException:
+            os.close(fd)
+            await asyncio.to_thread(self._remove_quietly, dest)
+            raise
+        os.close(fd)
+        return dest
+    
+    @staticmethod
+    async def _gather_or_cancel(aws: Iterable[Awaitable[Any]]) -> List[Any]:
+        """Await all of aws, cancelling the rest as soon as one fails"""
+        tasks = [asyncio.ensure_future(aw) for aw in aws]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    
+    @staticmethod
+    def _preallocate(fd: int, size: int) -> None:
+        """Reserve the full file size up front so range writes don't extend it piecemeal"""
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+    
+    @classmethod
+    def _remove_files(cls, paths: List[str]) -> None:
+        """Delete several files, ignoring errors"""
+        for path in paths:
+            cls._remove_quietly(path)
+    
+    @staticmethod
+    def _remove_quietly(path: str) -> None:
+        """Delete a file, ignoring errors"""
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+    
+    def _get_image_info_from_bytes(self, data: bytes, image_path: str, file_size: int,
+                                   partial: bool = False) -> Optional[ImageInfo]:
+        """Get image information from the whole file or, if partial, its head; file_size is the full upload's"""
+        info = self.converter.get_image_info_from_bytes(data, partial)
+        if info:
+            return self._make_image_info(image_path, info, file_size)
+        return None
+    
+    def _make_image_info(self, image_path: str, info: dict, file_size: int) -> ImageInfo:
+        """Build ImageInfo from the converter's probe, formatted like handle_image's"""
+        width, height = info['size']
+        return ImageInfo(
+            file_path=image_path,
+            size=self.converter.format_file_size(file_size),
+            format=info.get('format', 'Unknown'),
+            dimensions=f"{width}x{height}",
+            pixel_size=info['size']
+        )
+    
     def _get_image_info(self, image_path: str) -> Optional[ImageInfo]:
         """Get image information"""
         try:
             info = self.converter.get_image_info(image_path)
             if info:
-                return ImageInfo(
-                    file_path=image_path,
-                    size=info.get('size', 'Unknown'),
-                    format=info.get('format', 'Unknown'),
-                    dimensions=info.get('dimensions', 'Unknown')
-                )
+                return self._make_image_info(image_path, info, info['file_size'])
         except Exception as e:
-            logger.error(f"Error getting image info: {e}")
+            logger.error("Error getting image info: %s", e)
         return None
     
     async def error_handler(self, update: object, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle errors"""
-        logger.error(f"Update {update} caused error {context.error}")
+        logger.error("Update %s caused error %s", update, context.error)
         
         if update and hasattr(update, 'message'):
             try:
@@ -935,55 +1653,30 @@ class ImageToPdfBot:
             except Exception:
                 pass
     
+    def _per_user(self, callback: Callable[[Update, ContextTypes.DEFAULT_TYPE], Any]) -> Callable:
+        """Wrap a handler so each user's updates run one at a time, in arrival order"""
+        @functools.wraps(callback)
+        async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+            if update.effective_user is None:
+                await callback(update, context)
+                return
+            async with self.get_user_session(update.effective_user.id).lock:
+                await callback(update, context)
+        return wrapper
+    
     def setup_handlers(self, application: Application) -> None:
         """Setup bot handlers"""
-        # Command handlers
-        application.add_handler(CommandHandler("start", self.start))
-        application.add_handler(CommandHandler("help", self.help_command))
-        application.add_handler(CommandHandler("clear", self.clear_command))
-        application.add_handler(CommandHandler("convert_now", self.convert_now_command))
-        application.add_handler(CommandHandler("convertnow", self.convert_now_command))
-        application.add_handler(CommandHandler("compress_high", self.set_compression_high))
-        application.add_handler(CommandHandler("compresshigh", self.set_compression_high))  # Alias for compress_high
-        application.add_handler(CommandHandler("compress_medium", self.set_compression_medium))
-        application.add_handler(CommandHandler("compressmedium", self.set_compression_medium))  # Alias for compress_medium
-        application.add_handler(CommandHandler("compress_low", self.set_compression_low))
-        application.add_handler(CommandHandler("compresslow", self.set_compression_low))  # Alias for compress_low
-        application.add_handler(CommandHandler("merge", self.merge_pdfs_command))
-        application.add_handler(CommandHandler("split", self.split_pdf_command))
-        application.add_handler(CommandHandler("compress_pdf", self.compress_pdf_command))
-        application.add_handler(CommandHandler("url2pdf", self.url_to_pdf_command))
-        application.add_handler(CommandHandler("ocr", self.ocr_pdf_command))
-        application.add_handler(CommandHandler("ocr_image", self.ocr_image_command))
-        
-        # Message handlers
-        application.add_handler(MessageHandler(filters.PHOTO, self.handle_image))
-        application.add_handler(MessageHandler(filters.Document.IMAGE, self.handle_document))
-        application.add_handler(MessageHandler(filters.Document.ALL & ~filters.Document.IMAGE, self.handle_non_image_document))
+        for names, attr in COMMAND_SPEC:
+            application.add_handler(CommandHandler(names, self._per_user(getattr(self, attr))))
+        for message_filter, attr in MESSAGE_SPEC:
+            application.add_handler(MessageHandler(message_filter, self._per_user(getattr(self, attr))))
         
         # Error handler
         application.add_error_handler(self.error_handler)
     
     async def set_bot_commands(self, application: Application) -> None:
         """Set bot commands"""
-        commands = [
-            BotCommand("start", "Start bot and see welcome message"),
-            BotCommand("help", "Show help message"),
-            BotCommand("convert", "Choose compression options"),
-            BotCommand("convert_now", "Convert with current settings"),
-            BotCommand("compress_high", "Set high quality compression (95%)"),
-            BotCommand("compress_medium", "Set medium quality compression (85%)"),
-            BotCommand("compress_low", "Set low quality compression (70%)"),
-            BotCommand("merge", "Merge pending PDFs"),
-            BotCommand("split", "Split last PDF into pages"),
-            BotCommand("compress_pdf", "Compress last PDF"),
-            BotCommand("url2pdf", "Convert URL to PDF"),
-            BotCommand("ocr", "OCR last PDF"),
-            BotCommand("ocr_image", "Extract text from last image (optional language)"),
-            BotCommand("clear", "Clear all pending images")
-        ]
-        
-        await application.bot.set_my_commands(commands)
+        await application.bot.set_my_commands(self.BOT_COMMANDS)
         
         # Set bot profile picture if profile.jpg exists
         try:
@@ -994,26 +1687,46 @@ class ImageToPdfBot:
                 return
 
             # Profile picture is ready for manual upload
-            logger.info("📸 Bot profile picture is ready!")
-            logger.info(f"📁 Profile picture location: {profile_path}")
-            logger.info("💡 To set profile picture: Use @BotFather /setuserpic command")
-            logger.info("🔧 Bot profile picture setup completed (manual upload required)")
+            logger.info("📸 Bot profile picture ready at %s (upload via @BotFather /setuserpic)", profile_path)
 
         except Exception as e:
-            logger.exception(f"❌ Failed to prepare bot profile photo: {e}")
+            logger.exception("❌ Failed to prepare bot profile photo: %s", e)
     
     def run(self) -> None:
         """Run the bot"""
-        application = Application.builder().token(self.token).build()
+        builder = (
+            Application.builder()
+            .token(self.token)
+            .concurrent_updates(True)
+            .rate_limiter(AIORateLimiter(
+                overall_max_rate=GLOBAL_SEND_RATE[0],
+                overall_time_period=GLOBAL_SEND_RATE[1],
+                group_max_rate=GROUP_SEND_RATE[0],
+                group_time_period=GROUP_SEND_RATE[1],
+                max_retries=SEND_MAX_RETRIES
+            ))
+            .post_init(self._post_init)
+            .post_shutdown(self._shutdown)
+        )
+        if orjson is not None:
+            # Same pool sizes PTB picks for its default requests
+            builder = (
+                builder
+                .request(OrjsonRequest(connection_pool_size=BOT_API_POOL_SIZE))
+                .get_updates_request(OrjsonRequest())
+            )
+        application = builder.build()
         
         # Setup handlers
         self.setup_handlers(application)
         
-        # Set bot commands
-        application.job_queue.run_once(
-            lambda context: asyncio.create_task(self.set_bot_commands(application)),
-            when=1
-        )
+        # run_polling drives the current event loop; prefer libuv's where available
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            asyncio.set_event_loop(uvloop.new_event_loop())
         
         logger.info("Starting Image to PDF Bot...")
         application.run_polling()
@@ -5,21 +5,28 @@ Uses ReportLab for simple text rendering.
 
 import os
 import logging
-import textwrap
-from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import LETTER
 from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfmetrics import stringWidth
 
 logger = logging.getLogger(__name__)
 
+FONT_NAME = "Times-Roman"
+FONT_SIZE = 11
+
+# Glyph widths of the ASCII range, measured once at import. Most uploads are
+# plain ASCII, so short lines can be accepted from their length alone.
+ASCII_CHAR_WIDTHS = {chr(code): stringWidth(chr(code), FONT_NAME, FONT_SIZE) for code in range(128)}
+MAX_ASCII_CHAR_WIDTH = max(ASCII_CHAR_WIDTHS.values())
+
 
 class TextToPdfConverter:
     """Convert text and markdown files to PDF."""
 
-    SUPPORTED_FORMATS = {'.txt', '.md'}
+    SUPPORTED_FORMATS = frozenset({'.txt', '.md'})
 
     def __init__(self) -> None:
         self.supported_formats = self.SUPPORTED_FORMATS
@@ -40,46 +47,108 @@ class TextToPdfConverter:
 
         output_path = os.path.abspath(output_path)
 
-        with open(text_path, "r", encoding="utf-8", errors="replace") as f:
-            content = f.read()
+        # Read raw bytes and decode once; the size comes from the same read
+        with open(text_path, "rb") as f:
+            data = f.read()
+        content = data.decode("utf-8", errors="replace")
 
         self._render_text_to_pdf(content, output_path)
 
         return {
             "success": True,
             "pdf_path": output_path,
-            "original_size": os.path.getsize(text_path),
-            "pdf_size": os.path.getsize(output_path),
-            "original_format": Path(text_path).suffix.lower(),
+            "original_size": len(data),
+            "pdf_size": os.stat(output_path).st_size,
+            "original_format": os.path.splitext(text_path)[1].lower(),
         }
 
     def _render_text_to_pdf(self, content: str, output_path: str) -> None:
         page_width, page_height = LETTER
         margin = 0.75 * inch
-        font_name = "Times-Roman"
-        font_size = 11
         leading = 14
 
         usable_width = page_width - (2 * margin)
-        max_chars = int(usable_width / (font_size * 0.6))
-        max_chars = max(40, max_chars)
-
-        c = canvas.Canvas(output_path, pagesize=LETTER)
-        c.setFont(font_name, font_size)
-
-        y = page_height - margin
-        for raw_line in content.splitlines():
-            line = raw_line.rstrip("\n")
-            if not line:
-                y -= leading
-            else:
-                wrapped = textwrap.wrap(line, width=max_chars) or [""]
-                for segment in wrapped:
-                    if y < margin:
-                        c.showPage()
-                        c.setFont(font_name, font_size)
-                        y = page_height - margin
-                    c.drawString(margin, y, segment)
-                    y -= leading
+
+        # Words repeat heavily in prose, so measure each distinct token once
+        token_widths: Dict[str, float] = dict(ASCII_CHAR_WIDTHS)
+
+        def width_of(token: str) -> float:
+            width = token_widths.get(token)
+            if width is None:
+                width = token_widths[token] = stringWidth(token, FONT_NAME, FONT_SIZE)
+            return width
+
+        # Lines that fit between the top margin and the bottom margin
+        lines_per_page = int((page_height - 2 * margin) // leading) + 1
+
+        # Plan the whole layout first, then emit each page as one slice
+        lines = [
+            segment
+            for raw_line in content.splitlines()
+            for segment in self._wrap_line(raw_line.expandtabs(), usable_width, width_of)
+        ]
+
+        # Deflate page content streams; invariant keeps output byte-for-byte reproducible
+        c = canvas.Canvas(output_path, pagesize=LETTER, pageCompression=1, invariant=1)
+        for page_start in range(0, max(len(lines), 1), lines_per_page):
+            if page_start:
+                c.showPage()
+            # One text object per page: a single BT/ET block, with textLine
+            # advancing by the leading instead of repositioning every line
+            text = c.beginText(margin, page_height - margin)
+            text.setFont(FONT_NAME, FONT_SIZE, leading)
+            text_line = text.textLine
+            for segment in lines[page_start:page_start + lines_per_page]:
+                text_line(segment)
+            c.drawText(text)
 
         c.save()
+
+    @staticmethod
+    def _wrap_line(line: str, max_width: float, width_of: Callable[[str], float]) -> List[str]:
+        """Break a line at spaces so each segment's rendered width fits max_width."""
+        # Even if every character were the widest ASCII glyph, the line would fit
+        if line.isascii() and len(line) * MAX_ASCII_CHAR_WIDTH <= max_width:
+            return [line]
+        if stringWidth(line, FONT_NAME, FONT_SIZE) <= max_width:
+            return [line]
+
+        segments = []
+        space_width = width_of(" ")
+        current: List[str] = []
+        current_width = 0.0
+        # Keep indentation attached to the first word rather than as empty tokens
+        words = line.lstrip(" ").split(" ")
+        words[0] = line[:len(line) - len(line.lstrip(" "))] + words[0]
+        for word in words:
+            word_width = width_of(word)
+            if current and current_width + space_width + word_width > max_width:
+                segment = " ".join(current).rstrip(" ")
+                if segment:
+                    segments.append(segment)
+                current, current_width = [], 0.0
+                if not word:
+                    # Swallow runs of spaces at the break
+                    continue
+            if word_width > max_width and not current and word.startswith(" "):
+                # Drop indentation that would force the first word to be split
+                bare = word.lstrip(" ")
+                if width_of(bare) <= max_width:
+                    word, word_width = bare, width_of(bare)
+            if word_width > max_width:
+                # No space to break at: hard-split the long word by glyph widths
+                piece_start, piece_width = 0, 0.0
+                for i, ch in enumerate(word):
+                    ch_width = width_of(ch)
+                    if piece_width + ch_width > max_width and i > piece_start:
+                        segments.append(word[piece_start:i])
+                        piece_start, piece_width = i, 0.0
+                    piece_width += ch_width
+                word, word_width = word[piece_start:], piece_width
+            current_width = current_width + space_width + word_width if current else word_width
+            current.append(word)
+        segment = " ".join(current).rstrip(" ")
+        if segment:
+            segments.append(segment)
+        # A line of nothing but spaces still takes up a line
+        return segments or [""]